@@ -24,8 +24,8 @@ class Config:
             return self.config.get(section, option)
         else:
             self.logger.warning(
-                'Configuration option (%s/%s) not found. Returning default value (%s).' % (
-                    section, option, str(default)))
+                'Configuration option (%s/%s) not found. Returning default value (%s).',
+                section, option, default)
             return default
 
     def getboolean(self, section, option, default=None):
@@ -33,8 +33,8 @@ class Config:
             return self.config.getboolean(section, option)
         else:
             self.logger.warning(
-                'Configuration option (%s/%s) not found. Returning default value (%s).' % (
-                    section, option, str(default)))
+                'Configuration option (%s/%s) not found. Returning default value (%s).',
+                section, option, default)
             return default
 
     def get_base(self, section, option, default=None):
@@ -42,8 +42,8 @@ class Config:
             return self.base_config.get(section, option)
         else:
             self.logger.warning(
-                'Base configuration option (%s/%s) not found. Returning default value (%s).' % (
-                    section, option, str(default)))
+                'Base configuration option (%s/%s) not found. Returning default value (%s).',
+                section, option, default)
             return default        
 
     def set(self, section, option, value):
@@ -51,8 +51,8 @@ class Config:
             self.config.set(section, option, str(value))
         else:
             self.logger.warning(
-                'Configuration option (%s/%s) not found.' % (
-                    section, option))          
+                'Configuration option (%s/%s) not found.',
+                section, option)          
 
     def exists(self, section, option):
         return self.config.has_option(section, option)
@@ -74,11 +74,6 @@ class Ixchel:
 
     async def parse_message(self, **payload):
         message = payload['data']
-        # if 'username' in message:
-        #     self.logger.debug(message['username'])
-        # if 'user' in message:
-        #     self.logger.debug(message['user'])
-
         # ignore any messages sent from this bot
         if 'username' in message and message['username'] == self.bot_name:
             return
@@ -86,7 +81,6 @@ class Ixchel:
         if 'channel' in message:
             # message posted in ixchel channel?
             if message['channel'] == self.channel_id:
-                # self.slack.send_typing()
                 self.process(message)
             else:  # message posted directly to bot
                 self.logger.warning('Received direct message.')
@@ -101,7 +95,7 @@ class Ixchel:
         if re.search(r'^\\\w+', text):
             self.ixchel_commands.parse(message)
         else:
-            self.logger.warning('Received non-command text (%s).' % text)
+            self.logger.warning('Received non-command text (%s).', text)
 
 
 async def loop():  # main loop
@@ -151,7 +145,7 @@ loop = asyncio.get_event_loop()
 try:
     loop.run_until_complete(tasks)
 except asyncio.CancelledError as e:
-    logger.error('Exception ( % s).' % e)
+    logger.error('Exception (%s).', e)
 finally:
-    logger.info("%s has stopped." % ixchel.bot_name)
+    logger.info("%s has stopped.", ixchel.bot_name)
     loop.close()
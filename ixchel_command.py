@@ -40,6 +40,9 @@ matplotlib.use("Agg")
 # (needed 2024-9-1 b/c Linode servers are unable to connect to api.weather.gov using IPV6
 requests.packages.urllib3.util.connection.HAS_IPV6 = False
 
+# how long a filter we set (or read) is trusted before _get_image sets it again (s)
+FILTER_RECHECK_S = 300
+
 find_format_string = """[
 	{{
 		"type": "section",
@@ -101,6 +104,9 @@ class IxchelCommand:
         self.share = False
         self.target = "unknown"
         self.preview = True
+        # last filter known to be on the wheel:
+        # (name, time.monotonic() when confirmed, telescope.connections() at the time)
+        self._forget_filter()
         # build list of backslash commands
         self.init_commands()
         # init the Sky interface - why does this not use the Sky object?
@@ -114,6 +120,14 @@ class IxchelCommand:
         self.share = False
         self.target = "unknown"
         self.preview = True
+        # others may use the telescope while it is unlocked
+        self._forget_filter()
+
+    def _remember_filter(self, name):
+        self._filter_state = (name, time.monotonic(), self.telescope.connections())
+
+    def _forget_filter(self):
+        self._filter_state = (None, 0.0, None)
 
     def connect(self, command, error):
         # Runs the SSH connect to see if the connection can now be established
@@ -468,8 +482,8 @@ class IxchelCommand:
                     self.telescope.pinpoint(telescope_interface)
                 else:
                     self.logger.error(
-                        "Calculated offsets too large (dRA=%f deg, dDEC=%f deg)! Pinpoint aborted."
-                        % (ra_offset, dec_offset)
+                        "Calculated offsets too large (dRA=%f deg, dDEC=%f deg)! Pinpoint aborted.",
+                        ra_offset, dec_offset
                     )
                     self.hdr = hdr
                     # change filter back to original_filter
@@ -696,7 +710,7 @@ class IxchelCommand:
         try:
             telescope_interface = TelescopeInterface("get_where")
             # query telescope
-            self.telescope.get_precipitation(telescope_interface)
+            self.telescope.get_where(telescope_interface)
             # assign values
             ra = telescope_interface.get_output_value("ra")
             dec = telescope_interface.get_output_value("dec")
@@ -741,7 +755,7 @@ class IxchelCommand:
         try:
             telescope_interface = TelescopeInterface("get_sun")
             # query telescope
-            self.telescope.get_precipitation(telescope_interface)
+            self.telescope.get_sun(telescope_interface)
             # assign values
             alt = telescope_interface.get_output_value("alt")
             # send output to Slack
@@ -791,20 +805,17 @@ class IxchelCommand:
     def home_dome(self, command, user):
         try:
             self.slack.send_message("Homing dome. Please wait...")
-            # right
-            telescope_interface = TelescopeInterface("home_domer")
-            # query telescope
-            self.telescope.home_domer(telescope_interface)
-            # assign values
-            az_hit = telescope_interface.get_output_value("az_hit")
-            rem = telescope_interface.get_output_value("rem")
-            # left
-            telescope_interface = TelescopeInterface("home_domel")
+            # right, then left (only if right succeeded), in a single round trip
+            telescope_interfaces = [
+                TelescopeInterface("home_domer"),
+                TelescopeInterface("home_domel"),
+            ]
             # query telescope
-            self.telescope.home_domel(telescope_interface)
+            self.telescope.getter_many(telescope_interfaces, chained=True)
             # assign values
-            az_hit = telescope_interface.get_output_value("az_hit")
-            rem = telescope_interface.get_output_value("rem")
+            for telescope_interface in telescope_interfaces:
+                az_hit = telescope_interface.get_output_value("az_hit")
+                rem = telescope_interface.get_output_value("rem")
             # send output to Slack
             self.slack.send_message("The dome is homed.")
         except Exception as e:
@@ -1086,7 +1097,7 @@ class IxchelCommand:
         try:
             telescope_interface = TelescopeInterface("get_moon")
             # query telescope
-            self.telescope.get_precipitation(telescope_interface)
+            self.telescope.get_moon(telescope_interface)
             # assign values
             alt = telescope_interface.get_output_value("alt")
             phase = int(telescope_interface.get_output_value("phase") * 100)
@@ -1105,6 +1116,7 @@ class IxchelCommand:
             # assign values
             num = telescope_interface.get_output_value("num")
             filters = self.config.get("telescope", "filters").split("\n")
+            self._remember_filter(filters[num - 1])
             return filters[num - 1]
         except Exception as e:
             self.logger.error("Failed to get the current filter.")
@@ -1127,8 +1139,11 @@ class IxchelCommand:
             telescope_interface.set_input_value("num", num)
             self.telescope.set_filter(telescope_interface)
             num = telescope_interface.get_output_value("num")
+            self._remember_filter(filters[num - 1])
             return filters[num - 1]
         except Exception as e:
+            # the wheel may have moved, don't trust the last known filter
+            self._forget_filter()
             self.logger.error("Failed to set the filter to %s.", filter)
             raise
 
@@ -1230,8 +1245,15 @@ class IxchelCommand:
         if not dark:
             # self.logger.info('Centering the dome.') # remove this
             self._center_dome()
-        # set filter
-        self._set_filter(filter)
+        # set filter (skipped if it was set recently, on this connection, and is already
+        # in place)
+        name, confirmed, connections = self._filter_state
+        if (
+            name != filter
+            or time.monotonic() - confirmed > FILTER_RECHECK_S
+            or connections != self.telescope.connections()
+        ):
+            self._set_filter(filter)
         # take image
         if self.hdr:
             telescope_interface = TelescopeInterface("get_image_hdr")
@@ -1273,18 +1295,18 @@ class IxchelCommand:
                 self.slack.send_message(
                     "Obtaining image (%d of %d). Please wait..." % (index + 1, count)
                 )
+                low_fname = ""
                 if self.hdr:
                     fname = self.get_fitsFname(
                         self.target, filter, exposure, bin, slack_user, index, "H"
                     )
+                    low_fname = self.get_fitsFname(
+                        self.target, filter, exposure, bin, slack_user, index, "L"
+                    )
                 else:
                     fname = self.get_fitsFname(
                         self.target, filter, exposure, bin, slack_user, index, ""
                     )
-                # only gets used if self.hdr == True
-                low_fname = self.get_fitsFname(
-                    self.target, filter, exposure, bin, slack_user, index, "L"
-                )
                 path = self.get_fitsPath(slack_user)
                 success = self._get_image(
                     exposure, bin, filter, path, fname, False, low_fname
@@ -1565,6 +1587,8 @@ class IxchelCommand:
     def open_observatory(self, command, user):
         try:
             self.slack.send_message("Cracking observatory. Please wait...")
+            # opening may reset the filter wheel
+            self._forget_filter()
             telescope_interface = TelescopeInterface("open_observatory")
             # assign values
             # query telescope
@@ -1583,6 +1607,8 @@ class IxchelCommand:
         try:
             self.set_target()
             self.slack.send_message("Squeezing observatory. Please wait...")
+            # closing may reset the filter wheel
+            self._forget_filter()
             telescope_interface = TelescopeInterface("close_observatory")
             # assign values
             # query telescope
@@ -1603,6 +1629,8 @@ class IxchelCommand:
             # assign values
             # query telescope
             self.telescope.clear_lock(telescope_interface)
+            # others may use the telescope now
+            self._forget_filter()
             # send output to Slack
             self.slack.send_message("Telescope is unlocked.")
         except Exception as e:
@@ -1743,7 +1771,7 @@ class IxchelCommand:
                 self.logger.error("Failed to obtain image from observatory camera.")
         except Exception as e:
             self.logger.error(
-                "Failed to obtain image from observatory camera. Exception (%s)." % (e)
+                "Failed to obtain image from observatory camera. Exception (%s).", e
             )
             self.handle_error(command.group(0), "Failed to obtain image from observatory camera. Exception (%s)." % (e))
         # get sky images from Internet
@@ -1900,7 +1928,7 @@ class IxchelCommand:
                 if success:
                     self.slack_send_fits_file(path + fname, fname)
                 else:
-                    self.logger.error("Error. Image command failed (%s)." % fname)
+                    self.logger.error("Error. Image command failed (%s).", fname)
                     continue
 
                 # calc psf
@@ -2277,15 +2305,11 @@ class IxchelCommand:
         return fname
 
     def get_fitsPath(self, user):
-        path = (
-            self.image_dir
-            + "/"
-            + datetime.datetime.utcnow().strftime("%Y")
-            + "/"
-            + datetime.datetime.utcnow().strftime("%Y-%m-%d")
-            + "/"
-            + user.lower()
-            + "/"
+        # one clock read, so the year and date directories can't straddle midnight
+        path = "%s/%s/%s/" % (
+            self.image_dir,
+            datetime.datetime.utcnow().strftime("%Y/%Y-%m-%d"),
+            user.lower(),
         )
         return path
 
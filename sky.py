@@ -128,13 +128,13 @@ class SolarSystem:
             # no matches? go home
             if re.search("No matches found", output):
                 self.logger.warning(
-                    "No matches found in JPL Horizons for %s."
-                    % search_strings[repeat].upper()
+                    "No matches found in JPL Horizons for %s.",
+                    search_strings[repeat].upper()
                 )
             elif re.search("Target body name:", output):
                 self.logger.info(
-                    "Single match found in JPL Horizons for %s."
-                    % search_strings[repeat].upper().replace(suffix, "")
+                    "Single match found in JPL Horizons for %s.",
+                    search_strings[repeat].upper().replace(suffix, "")
                 )
                 # just one match?
                 # if major body search (repeat = 0), ignore small body results
@@ -149,16 +149,16 @@ class SolarSystem:
                         objects.append(match.group(1))
                     else:
                         self.logger.error(
-                            "Error. Could not parse id for single match major body (%s)."
-                            % search_strings[repeat].upper().replace(suffix, "")
+                            "Error. Could not parse id for single match major body (%s).",
+                            search_strings[repeat].upper().replace(suffix, "")
                         )
                 else:
                     # user search term is unique, so use it!
                     objects.append(search_strings[repeat].upper().replace(suffix, ""))
             elif repeat == 1 and re.search("Matching small-bodies", output):
                 self.logger.info(
-                    "Multiple small bodies found in JPL Horizons for %s."
-                    % search_strings[repeat].upper()
+                    "Multiple small bodies found in JPL Horizons for %s.",
+                    search_strings[repeat].upper()
                 )
                 # Matching small-bodies:
                 #
@@ -188,8 +188,8 @@ class SolarSystem:
                         self.logger.info("Multiple JPL small body parsing successful!")
             elif repeat == 0 and re.search("Multiple major-bodies", output):
                 self.logger.info(
-                    "Multiple major bodies found in JPL Horizons for %s."
-                    % search_strings[repeat].upper()
+                    "Multiple major bodies found in JPL Horizons for %s.",
+                    search_strings[repeat].upper()
                 )
                 # Multiple major-bodies match string "50*"
                 #
@@ -245,8 +245,8 @@ class SolarSystem:
                 solarSystemObjects.append(solarSystemObject)
             except Exception as e:
                 self.logger.error(
-                    "Error. Could not determine RA/DEC of small body. Exception (%s)."
-                    % e
+                    "Error. Could not determine RA/DEC of small body. Exception (%s).",
+                    e
                 )
                 pass
         return solarSystemObjects
@@ -462,8 +462,8 @@ class Satellite:
                     sats = urllib.urlopen(url).readlines()
                 except Exception as e:
                     self.logger.error(
-                        "Failed to open satellite database (%s). Exception (%s)."
-                        % (url, e)
+                        "Failed to open satellite database (%s). Exception (%s).",
+                        url, e
                     )
                     continue
             # clean it up
@@ -475,7 +475,7 @@ class Satellite:
             ]
             # add sats to norad database
             db += sats
-        self.logger.info("Loaded %d satellite TLE(s) into the database." % len(db))
+        self.logger.info("Loaded %d satellite TLE(s) into the database.", len(db))
         return db
 
     def plot(self, satellite):
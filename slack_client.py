@@ -38,33 +38,24 @@ class Slack:
         self.web = slack.WebClient(
             token=self.token, run_async=False, use_sync_aiohttp=False)
 
-    # def send_typing(self, channel=None):
-    #     # use default values if none sent
-    #     if channel == None:
-    #         channel = self.channel
-    #     try:
-    #         self.rtm.typing(channel)
-    #     except Exception as e:
-    #         self.logger.error('Could not send typing. Exception (%s).' % e)
-
     def is_connected(self):
         try:
             self.rtm.ping()
             return True
         except client_err.SlackClientNotConnectedError as e:
             self.logger.error(
-                'Slack RTM client is not connected. Exception (%s).' % e)
+                'Slack RTM client is not connected. Exception (%s).', e)
             return False
 
     def send_block_message(self, block_message, channel=None, username=None):
         if not self.connected:
             self.logger.warning(
-                'Could not send message (%s). Not connected.' % block_message)
+                'Could not send message (%s). Not connected.', block_message)
             return False
         # use default values if none sent
-        if channel == None:
+        if channel is None:
             channel = self.channel
-        if username == None:
+        if username is None:
             username = self.bot_name
         try:
             self.web.chat_postMessage(
@@ -75,19 +66,19 @@ class Slack:
             )
         except Exception as e:
             self.logger.error(
-                'Could not send block message (%s). Exception (%s).' % (block_message, e))
+                'Could not send block message (%s). Exception (%s).', block_message, e)
             return False
         return True
 
     def send_message(self, message, attachments=None, channel=None, username=None, blocks=None):
         if not self.connected:
             self.logger.warning(
-                'Could not send message (%s). Not connected.' % message)
+                'Could not send message (%s). Not connected.', message)
             return False
         # use default values if none sent
-        if channel == None:
+        if channel is None:
             channel = self.channel
-        if username == None:
+        if username is None:
             username = self.bot_name
         try:
             self.web.chat_postMessage(
@@ -97,26 +88,26 @@ class Slack:
                 username=username,
                 attachments=attachments
             )
-            self.logger.info('Sent Slack message: %s.' % message)
+            self.logger.info('Sent Slack message: %s.', message)
         except Exception as e:
             self.logger.error(
-                'Could not send message (%s). Exception (%s).' % (message, e))
+                'Could not send message (%s). Exception (%s).', message, e)
             return False
         return True
 
     def send_file(self, path, title=None, channel=None, username=None):
         if not os.path.exists(path):
             self.logger.error(
-                'File (%s) does not exist.' % path)
+                'File (%s) does not exist.', path)
             return False
         if not self.connected:
             self.logger.warning(
-                'Could not send file (%s). Not connected.' % path)
+                'Could not send file (%s). Not connected.', path)
             return False
         # use default values if none sent
-        if channel == None:
+        if channel is None:
             channel = self.channel
-        if username == None:
+        if username is None:
             username = self.bot_name
         try:
             files = {'file': open(path, 'rb')}
@@ -126,7 +117,7 @@ class Slack:
                               files=files, data=data)
         except Exception as e:
             self.logger.error(
-                'Could not send file (%s). Exception.' % (path, e))
+                'Could not send file (%s). Exception (%s).', path, e)
             return False
         return r.ok
 
@@ -136,7 +127,7 @@ class Slack:
             return result['channels']
         except Exception as e:
             self.logger.error(
-                'Failed to get channel list. Exception (%s).' % e)
+                'Failed to get channel list. Exception (%s).', e)
             return []
 
     def get_channel_id(self, channel):
@@ -144,20 +135,11 @@ class Slack:
         for ch in self.get_channels():
             if 'name' in ch and ch['name'] == channel:
                 channel_id = ch['id']
-                self.logger.info('Channel (%s) id is %s.' %
-                                 (channel, channel_id))
+                self.logger.info('Channel (%s) id is %s.',
+                                 channel, channel_id)
                 break
         return channel_id
 
-    # def get_users(self):
-    #     try:
-    #         result = self.web.api_call("users.list")
-    #         return result['members']
-    #     except Exception as e:
-    #         self.logger.error(
-    #             'Failed to get user list. Exception (%s).' % e)
-    #         return []
-
     def get_user_by_id(self, id):
         try:
             # find this user    
@@ -165,11 +147,11 @@ class Slack:
             params['user'] = id # identify user by id      
             result = self.web.api_call('users.info', params = params)       
             if 'error' in result: # ooops
-                self.logger.error('Failed to find user. Error (%s).' % result['error'])
+                self.logger.error('Failed to find user. Error (%s).', result['error'])
                 return {}
             else:           
                 return result['user']
         except Exception as e:
             self.logger.error(
-                'Failed to find user. Exception (%s).' % e)
+                'Failed to find user. Exception (%s).', e)
             return {}
@@ -2,16 +2,161 @@
 Telescope executes telescope commands via an SSH connection to the aster server (the SEO telescope host).
 
 """
-import subprocess
+import collections
+import functools
 import re
+import select
+import shutil
+import socket
 import logging
 import threading
-import paramiko
+import time
+import uuid
 from astropy.coordinates import EarthLocation
 import astropy.units as u
 from slack_client import Slack
 from config import Config
 from globals import retry_counter
+from telescope_interface import parse_many
+
+# ssh section of the configuration, read once per SSH instance by load_ssh_config
+SSHConfig = collections.namedtuple("SSHConfig", "server username key_path keepalive")
+
+# authenticated transports shared by every SSH instance, keyed by (server, username, key_path)
+_POOL = {}
+_POOL_LOCK = threading.Lock()
+
+# algorithms to negotiate first: AEAD / AES modes that run on AES-NI and CLMUL, and
+# curve25519 key exchange. Anything this paramiko does not implement is skipped.
+_PREFERRED_CIPHERS = (
+    "aes128-gcm@openssh.com",
+    "aes256-gcm@openssh.com",
+    "chacha20-poly1305@openssh.com",
+    "aes128-ctr",
+    "aes256-ctr",
+)
+_PREFERRED_KEX = ("curve25519-sha256", "curve25519-sha256@libssh.org")
+_PREFERRED_DIGESTS = ("hmac-sha2-256-etm@openssh.com", "hmac-sha2-256")
+
+# flow control sized for FITS downloads over a WAN link (bandwidth-delay product)
+_WINDOW_SIZE = 4 * 1024 * 1024
+_MAX_PACKET_SIZE = 256 * 1024
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# extra seconds the local deadline allows a command timed out remotely (`timeout N`) to
+# report back before the channel is given up on
+_TIMEOUT_GRACE_S = 10
+
+# marks the boundary between outputs in a getter_many response
+GETTER_SEPARATOR = "__IXCHEL_NEXT__"
+# pid echoed by the shell for a background command
+PID_RE = re.compile(r"([0-9]+)$")
+
+
+class ChannelOpenError(ConnectionError):
+    """A session or shell could not be opened, so the command was never sent"""
+
+
+def load_ssh_config(config):
+    """Read the ssh settings of this configuration (SSH keeps the result, so the
+    ConfigParser lookups happen once per instance)
+
+    Returns:
+        SSHConfig: server, username, key_path and keepalive (seconds)
+    """
+    return SSHConfig(
+        config.get("ssh", "server"),
+        config.get("ssh", "username"),
+        config.get("ssh", "key_path"),
+        int(config.get("ssh", "keepalive", 30)),
+    )
+
+
+def _load_key(key_path):
+    """Load a private key file, trying each key type paramiko supports
+
+    Raises:
+        paramiko.PasswordRequiredException: the key is encrypted
+    """
+    import paramiko
+
+    # DSSKey is gone from newer paramiko releases
+    key_classes = (
+        paramiko.RSAKey,
+        paramiko.ECDSAKey,
+        paramiko.Ed25519Key,
+        getattr(paramiko, "DSSKey", None),
+    )
+    for key_class in key_classes:
+        if key_class is None:
+            continue
+        try:
+            return key_class.from_private_key_file(key_path)
+        except paramiko.PasswordRequiredException:
+            # the right key type, but it can't be used without a passphrase
+            raise
+        except paramiko.SSHException:
+            continue
+    raise paramiko.SSHException("Unsupported private key (%s)." % key_path)
+
+
+def _prefer(available, preferred):
+    """Reorder the available algorithms so the supported preferred ones come first"""
+    first = tuple(name for name in preferred if name in available)
+    return first + tuple(name for name in available if name not in first)
+
+
+def _get_transport(server, username, key_path, keepalive=30):
+    """Return the pooled transport for this server/user/key, (re)connecting if needed
+
+    Returns:
+        paramiko.Transport: an active, authenticated transport
+    """
+    # paramiko (and the cryptography stack behind it) is only imported once SSH is used
+    import paramiko
+
+    key = (server, username, key_path)
+    with _POOL_LOCK:
+        transport = _POOL.get(key)
+        if transport is None or not transport.is_active():
+            if transport is not None:
+                transport.close()
+            # bounded TCP connect (SSHClient used to apply timeout=60 here)
+            sock = socket.create_connection((server, 22), timeout=60)
+            transport = paramiko.Transport(
+                sock,
+                default_window_size=_WINDOW_SIZE,
+                default_max_packet_size=_MAX_PACKET_SIZE,
+            )
+            options = transport.get_security_options()
+            options.ciphers = _prefer(options.ciphers, _PREFERRED_CIPHERS)
+            options.kex = _prefer(options.kex, _PREFERRED_KEX)
+            options.digests = _prefer(options.digests, _PREFERRED_DIGESTS)
+            # fail fast on a stuck handshake instead of blocking the control loop
+            transport.banner_timeout = 10
+            transport.auth_timeout = 10
+            try:
+                transport.start_client(timeout=60)
+                transport.auth_publickey(username, _load_key(key_path))
+            except Exception:
+                # don't leak the socket and transport thread of a failed handshake
+                transport.close()
+                sock.close()
+                raise
+            # heartbeats keep idle sessions (and NAT mappings) alive between commands
+            transport.set_keepalive(keepalive)
+            _POOL[key] = transport
+    return transport
+
+
+# the site does not move, so build its EarthLocation once per (lat, lon, height)
+@functools.lru_cache(maxsize=8)
+def _earth_location(latitude, longitude, elevation):
+    return EarthLocation(
+        lat=latitude * u.deg,
+        lon=longitude * u.deg,
+        height=elevation * u.m,
+    )
 
 
 class SSH:
@@ -27,13 +172,20 @@ class SSH:
         # defaults
         self.enabled = self.config.get("telescope", "use_ssh")
         self.logger = logging.getLogger("SSH")
-        self.server = self.config.get("ssh", "server")
-        self.username = self.config.get("ssh", "username")
-        self.key_path = self.config.get("ssh", "key_path")
-
-        # init paramiko
-        self.ssh = paramiko.SSHClient()
-        self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self.cfg = load_ssh_config(self.config)
+
+        # shared paramiko transport (assigned on connect)
+        self.transport = None
+        # long-lived SFTP client (opened on first transfer)
+        self._sftp = None
+        # persistent shell channel for foreground commands (opened on first use),
+        # serialized by its own lock: self.lock is the abort lock and must stay free
+        # while a command runs
+        self._shell = None
+        self._shell_lock = threading.Lock()
+        # successful connects so far; state remembered about the telescope (e.g. the
+        # filter wheel) is stale once this changes
+        self.connections = 0
 
     def connect(self, silent=False):
         """Establish the SSH connection (configured at initialization)
@@ -55,11 +207,15 @@ class SSH:
             else:
                 retry_counter += 1
 
-            self.ssh.connect(
-                self.server, username=self.username, key_filename=self.key_path, timeout=60
+            self.transport = _get_transport(
+                self.cfg.server, self.cfg.username, self.cfg.key_path, self.cfg.keepalive
             )
-
-            self.ssh.exec_command("echo its alive")  # test the connection
+            with self._shell_lock:
+                # any shell left over belongs to the previous transport
+                if self._shell is not None:
+                    self._shell.close()
+                self._shell = None
+            self.connections += 1
             self.slack.send_message("Connected to the telescope!")
             
             self.enabled = True # I would like to move this out of here, but it breaks Paramiko / puts the program in a loop
@@ -70,43 +226,169 @@ class SSH:
             self.logger.error("SSH initialization failed. Exception (%s).", e)
         return False
 
-    def command(self, command, is_background):
+    def command(self, command, is_background, timeout=None):
         """Execute a command over the SSH connection,
             either in the background or foreground
 
         Args:
             command (str): command string
             is_background (bool): run the given command in the background
+            timeout (float, optional): seconds to wait for the output (channel level)
 
         Returns:
             _type_: _description_ TODO: type this properly
         """
+        # opening the channel is the liveness probe: reconnect and retry once if it fails.
+        # Any later failure is surfaced, the command may already have run remotely
+        # (tx point, image, tx lock, ... must not run twice)
+        try:
+            return self._command(command, is_background, timeout)
+        except ChannelOpenError as e:
+            self.logger.warning("SSH command failed. Exception (%s). Reconnecting...", e)
+            if not self.connect(silent=True):
+                raise
+        return self._command(command, is_background, timeout)
+
+    def _command(self, command, is_background, timeout=None):
         if is_background:
-            return self._command_background(command)
+            return self._command_background(command, timeout)
+
+        return self._command_foreground(command, timeout=timeout)
+
+    def _exec(self, command, timeout=None):
+        """Run a command in a fresh session on the shared transport and read its output
+        (reads raise socket.timeout after timeout seconds)
+
+        Returns:
+            tuple: stdout lines, stderr lines
+        """
+        import paramiko
+
+        try:
+            channel = self.transport.open_session()
+        except (paramiko.SSHException, EOFError, socket.error) as e:
+            raise ChannelOpenError("Could not open an SSH session (%s)." % e) from e
+        try:
+            channel.settimeout(timeout)
+            channel.exec_command(command)
+            # nothing is ever written to stdin, send EOF so the remote command cannot wait on it
+            channel.shutdown_write()
+            # drain the streams before waiting on the exit status, otherwise a full
+            # channel window stalls the remote process and the wait never returns
+            stdout = channel.makefile("rb").read()
+            stderr = channel.makefile_stderr("rb").read()
+            channel.recv_exit_status()
+        finally:
+            # sessions are single-use; this also frees the session of a command that timed out
+            channel.close()
+        return (
+            stdout.decode("utf-8", "replace").splitlines(),
+            stderr.decode("utf-8", "replace").splitlines(),
+        )
+
+    def _open_shell(self):
+        """Start a shell on its own channel and drain anything the login scripts print
+
+        No pty is requested, so nothing is echoed and stdout/stderr stay separate.
+        """
+        shell = self.transport.open_session()
+        shell.invoke_shell()
+        self._shell = shell
+        self._run_in_shell("true")
+
+    def _run_in_shell(self, command, timeout=None):
+        """Send a command to the shell channel and read until its sentinels come back
+        (caller must hold self._shell_lock)
+
+        The command runs in a subshell, so cd/setenv don't carry over to the next one,
+        with stdin from /dev/null, so it can't read the sentinels meant for the shell.
+        There is no deadline unless the caller sets one (Telescope.command then also
+        stops the process remotely with `timeout N`). A shell that times out or returns
+        garbled sentinels is closed and discarded, the next command opens a fresh one.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sentinel = "__IXCHEL_END__%s" % uuid.uuid4().hex
+        out_marker = ("%s_" % sentinel).encode()
+        err_marker = ("%s\n" % sentinel).encode()
+        script = "( %s ) < /dev/null\necho %s_$?\necho %s > /dev/stderr\n"
+        self._shell.sendall((script % (command, sentinel, sentinel)).encode())
+        stdout = b""
+        stderr = b""
+        while not (out_marker in stdout and stdout.endswith(b"\n")) or err_marker not in stderr:
+            if self._shell.recv_ready():
+                stdout += self._shell.recv(32768)
+            elif self._shell.recv_stderr_ready():
+                stderr += self._shell.recv_stderr(32768)
+            elif self._shell.exit_status_ready():
+                self._discard_shell()
+                raise EOFError("Shell channel closed while running (%s)." % command)
+            elif deadline is not None and time.monotonic() > deadline:
+                # the command is still running in the shell (or the shell is still
+                # waiting for the rest of it), so the shell can't be reused
+                self._discard_shell()
+                raise socket.timeout("Command (%s) timed out after %s s." % (command, timeout))
+            else:
+                select.select([self._shell], [], [], 1)
+        stdout, _, status = stdout.rpartition(out_marker)
+        stderr = stderr[: stderr.rfind(err_marker)]
+        try:
+            exit_status = int(status)
+        except ValueError:
+            # the output got out of step with the sentinels, don't trust this shell again
+            self.logger.error("Command (%s) returned no exit status.", command)
+            self._discard_shell()
+            exit_status = None
+        return (
+            stdout.decode("utf-8", "replace").splitlines(),
+            stderr.decode("utf-8", "replace").splitlines(),
+            exit_status,
+        )
+
+    def _discard_shell(self):
+        """Close the shell channel and forget it (caller must hold self._shell_lock)"""
+        self._shell.close()
+        self._shell = None
 
-        return self._command_foreground(command)
+    def exec_in_shell(self, command, timeout=None):
+        """Execute a command on the persistent shell channel, saving the channel open
+        that exec_command pays per command
 
-    def _command_background(self, command):
+        Args:
+            command (str): command string
+            timeout (float, optional): seconds to wait for the command to finish
+                (waits for as long as it takes by default)
+
+        Returns:
+            tuple: stdout lines, stderr lines, exit status
+        """
+        import paramiko
+
+        with self._shell_lock:
+            if self._shell is None or self._shell.closed:
+                try:
+                    self._open_shell()
+                except (paramiko.SSHException, EOFError, socket.error) as e:
+                    raise ChannelOpenError("Could not open an SSH shell (%s)." % e) from e
+            return self._run_in_shell(command, timeout)
+
+    def _command_background(self, command, timeout=None):
         """Background command execution"""
         if not self.is_connected():
             self.logger.error(
                 "Background command (%s) failed. SSH client is not connected.", command
             )
-            return False
+            raise ConnectionError("SSH client is not connected")
         # run command
         result = {"response": None, "stdout": [], "stderr": [], "pid": None}
         try:
             self.logger.info("Running background command: %s", command)
-            stdin, stdout, stderr = self.ssh.exec_command(f"{command} &")
-            stdout.channel.recv_exit_status()
-            result["stdout"] = stdout.readlines()
-            result["stderr"] = stderr.readlines()
+            result["stdout"], result["stderr"] = self._exec(f"{command} &", timeout)
             self.logger.debug(result["stdout"])
             self.logger.debug(result["stderr"])
             if len(result["stdout"]) > 0:
                 result["response"] = result["stdout"][0]
                 # get the pid
-                match = re.search(r"([0-9]+)$", result["response"])
+                match = PID_RE.search(result["response"])
                 if match:
                     result["pid"] = int(match.group(1))
                 else:
@@ -121,24 +403,22 @@ class SSH:
                 self.logger.warning("Command (%s) returned no response.", (command))
         except Exception as e:
             self.logger.error("SSH command failed. Exception (%s).", e)
+            raise
         return result
 
-    def _command_foreground(self, command):
-        """Foreground command execution"""
+    def _command_foreground(self, command, timeout=None):
+        """Foreground command execution (on the shared shell)"""
         self.logger.info(command)
         if not self.is_connected():
             self.logger.error(
                 "Foreground command (%s) failed. SSH client is not connected.", command
             )
-            return False
+            raise ConnectionError("SSH client is not connected")
         # run command
         result = {"response": None, "stdout": [], "stderr": [], "pid": None}
         try:
             self.logger.info("Running foreground command: %s", command)
-            stdin, stdout, stderr = self.ssh.exec_command(command)
-            stdout.channel.recv_exit_status()
-            result["stdout"] = stdout.readlines()
-            result["stderr"] = stderr.readlines()
+            result["stdout"], result["stderr"], _ = self.exec_in_shell(command, timeout)
             self.logger.debug(result["stdout"])
             self.logger.debug(result["stderr"])
             if len(result["stdout"]) > 0:
@@ -153,6 +433,7 @@ class SSH:
                 self.logger.warning("Command (%s) returned no response.", command)
         except Exception as e:
             self.logger.error("SSH command failed. Exception (%s).", e)
+            raise
         return result
 
     def get_file(self, remote_path, local_path):
@@ -169,14 +450,43 @@ class SSH:
             self.logger.error("SFTP failed. SSH client is not connected.")
             return False
         try:
-            sftp = self.ssh.open_sftp()
-            sftp.get(remote_path, local_path)
-            sftp.close()
+            try:
+                self._copy_from_remote(remote_path, local_path)
+            except (EOFError, ConnectionResetError):
+                # the cached SFTP channel went stale, open a fresh one and retry once
+                self._close_sftp()
+                self._copy_from_remote(remote_path, local_path)
         except Exception as e:
             self.logger.error("SFTP failed. Exception (%s).", e)
             return False
         return True
 
+    def _copy_from_remote(self, remote_path, local_path):
+        with self._get_sftp().open(remote_path, "rb") as remote_file:
+            # pipeline the read requests instead of waiting on each block
+            remote_file.prefetch()
+            with open(local_path, "wb") as local_file:
+                shutil.copyfileobj(remote_file, local_file, _COPY_BUFFER_SIZE)
+
+    def _close_sftp(self):
+        """Close and forget the cached SFTP client, so its channel is released"""
+        if self._sftp is not None:
+            try:
+                self._sftp.close()
+            except Exception as e:
+                self.logger.debug("Closing a stale SFTP client failed. Exception (%s).", e)
+            self._sftp = None
+
+    def _get_sftp(self):
+        """Return the cached SFTP client, reopening it if its transport went away"""
+        import paramiko
+
+        channel = self._sftp.get_channel() if self._sftp is not None else None
+        if channel is None or channel.closed or not channel.get_transport().is_active():
+            self._close_sftp()
+            self._sftp = paramiko.SFTPClient.from_transport(self.transport)
+        return self._sftp
+
     def is_connected(self):
         """Test the SSH connection, and attempt to reconnect otherwise
 
@@ -186,23 +496,20 @@ class SSH:
         if not self.enabled:
             self.logger.warning("SSH is disabled, yet tried to test connection.")
             return False
-        try:
-            self.ssh.exec_command("echo its alive")  # test the connection
+        if self.transport is not None and self.transport.is_active():
             return True
-        except Exception as e:  # try to reconnect
-            self.logger.warning(
-                "SSH command failed. Exception (%s). Reconnecting...", e
-            )
-            return self.connect(silent=True)
+        # try to reconnect
+        self.logger.warning("SSH transport is not active. Reconnecting...")
+        return self.connect(silent=True)
 
 
 class Telescope:
-    ssh = None
 
     def __init__(self, config: Config, slack: Slack, lock: threading.Lock):
         self.logger = logging.getLogger("Telescope")
         self.slack = slack
         self.config = config
+        self.lock = lock
         self.use_ssh = self.config.getboolean("telescope", "use_ssh", False)
 
         self.logger.info("Should use SSH? %s", self.use_ssh)
@@ -211,60 +518,92 @@ class Telescope:
         self.longitude = self.config.get("telescope", "longitude")
         self.elevation = self.config.get("telescope", "elevation")
         self.image_dir = self.config.get("telescope", "image_dir")
-        self.earthLocation = EarthLocation(
-            lat=float(self.latitude) * u.deg,
-            lon=float(self.longitude) * u.deg,
-            height=float(self.elevation) * u.m,
+        self.earthLocation = _earth_location(
+            float(self.latitude), float(self.longitude), float(self.elevation)
         )
 
-        # create ssh instance
-        self.ssh = SSH(config, slack, lock)
-        # enable the connection based on configuration
-        if self.use_ssh:
-            self.ssh.connect()
-        else:
+        # recent getter responses, keyed by command: (timestamp, response)
+        self._cache = {}
+
+        # the ssh instance is created (and connected) on first use, see the ssh property
+        self._ssh = None
+        self._ssh_lock = threading.Lock()
+        if not self.use_ssh:
             self.slack.send_message(
                 "Telescope interface is running, but the SSH connection is currently disabled."
             )
 
-    def command(self, command, is_background, use_communicate=True, timeout=0):
+    @property
+    def ssh(self):
+        # getters may run on worker threads, make sure only one of them creates the instance
+        with self._ssh_lock:
+            if self._ssh is None:
+                ssh = SSH(self.config, self.slack, self.lock)
+                # enable the connection based on configuration
+                if self.use_ssh:
+                    ssh.connect()
+                self._ssh = ssh
+        return self._ssh
+
+    def command(self, command, is_background, timeout=0):
         self.logger.info("Attempting to run command, %s", command)
-        result = {"stdout": [], "stderr": []}
-        # add a timeout to this command
+        # add a timeout to this command: enforced remotely, so the process is actually
+        # stopped, and locally in case the remote side stops answering altogether
+        ssh_timeout = None
         if timeout > 0:
             command = "timeout %f " % timeout + command
+            ssh_timeout = timeout + _TIMEOUT_GRACE_S
         # use ssh
         if self.use_ssh:
             if not self.ssh.is_connected():
                 self.logger.warning("SSH is not connected")
-                # need to reconnect?
-                return
-            else:  
-                try:
-                    self.ssh.command("echo its alive", is_background)
-                except Exception as e:
-                    self.logger.warning("SSH is not connected. Reconnecting...")
-                    self.ssh.connect(silent=True)
+                raise ConnectionError("Telescope SSH is not connected")
             try:
-                return self.ssh.command(command, is_background)
+                return self.ssh.command(command, is_background, ssh_timeout)
             except Exception as e:
                 self.logger.error("Command (%s) via SSH failed. Exception (%s).", command,  e)
-                return result
+                raise
         else:
             raise ConnectionError("Telescope SSH is currently disconnected")
 
     def get_file(self, remote_path, local_path):
         return self.ssh.get_file(remote_path, local_path)
 
+    # number of SSH (re)connects so far (0 before the first one)
+    def connections(self):
+        return self._ssh.connections if self._ssh is not None else 0
+
     # Generic getter is the standard for all SEO get commands
     # To support future telescope interfaces,
     # these will be called by the *explicit* getter
 
     def getter(self, interface):
-        results = self.command(interface.get_command(), interface.is_background())
+        command = interface.get_command()
+        cache_ttl = interface.get_cache_ttl()
+        cached = self._cache.get(command)
+        if cached is not None and time.monotonic() - cached[0] < cache_ttl:
+            # recent enough, no need to ask the telescope again
+            interface.assign_outputs(cached[1])
+            return
+        results = self.command(command, interface.is_background())
         result = results["response"]
         # parse the result and assign values to output valuse
         interface.assign_outputs(result)
+        # only a response that parsed is worth reusing (not an error or an empty reply)
+        if cache_ttl > 0:
+            self._cache[command] = (time.monotonic(), result)
+
+    # Run several getters as one remote command (a single round trip),
+    # then give each interface its own slice of the output.
+    # chained: run each command only if the one before it succeeded (for commands
+    # that move something, e.g. homing); the missing slices then raise in parse_many
+    def getter_many(self, interfaces, chained=False):
+        joiner = " && echo %s && " if chained else "; echo %s; "
+        command = (joiner % GETTER_SEPARATOR).join(
+            interface.get_command() for interface in interfaces
+        )
+        results = self.command(command, False)
+        parse_many(interfaces, results["response"], GETTER_SEPARATOR)
 
     # Generic setter is the standard for all SEO get commands
     # To support future telescope interfaces,
@@ -5,26 +5,25 @@ including the command, inputs, and expected outputs. These commands are executed
 
 """
 
+import functools
 import logging
 import re
 
+logger = logging.getLogger('ixchel.TelescopeInterface')
+
 telescope_interfaces = {
     'track': {
         'command': 'tx track {on_off}',
         'inputs': {
-            'on_off': {
-                'value': None
-            }
+            'on_off': {}
         },
         'outputs': {
             'ha': {
-                'regex': r'(?<=ha=).*?(?= )',
-                'value': None,
+                'regex': r'\bha=(\S*)',
                 'type': float
             },
             'dec': {
-                'regex': r'(?<=dec=).*?$',
-                'value': None,
+                'regex': r'\bdec=(.*)$',
                 'type': float
             },
         }
@@ -32,19 +31,15 @@ telescope_interfaces = {
     'get_track': {
         'command': 'tx track',
         'inputs': {
-            'on_off': {
-                'value': None
-            }
+            'on_off': {}
         },
         'outputs': {
             'ha': {
-                'regex': r'(?<=ha=).*?(?= )',
-                'value': None,
+                'regex': r'\bha=(\S*)',
                 'type': float
             },
             'dec': {
-                'regex': r'(?<=dec=).*?$',
-                'value': None,
+                'regex': r'\bdec=(.*)$',
                 'type': float
             },
         }
@@ -52,22 +47,16 @@ telescope_interfaces = {
     'point': {
         'command': 'tx point ra={ra} dec={dec}',
         'inputs': {
-            'ra': {
-                'value': None
-            },
-            'dec': {
-                'value': None
-            }
+            'ra': {},
+            'dec': {}
         },
         'outputs': {
             'move': {
-                'regex': r'(?<=move=).*?(?= )',
-                'value': None,
+                'regex': r'\bmove=(\S*)',
                 'type': float
             },
             'dist': {
-                'regex': r'(?<=dist=).*?$',
-                'value': None,
+                'regex': r'\bdist=(.*)$',
                 'type': float
             },
         }
@@ -75,30 +64,18 @@ telescope_interfaces = {
     'get_image_hdr': {
         'command': 'mkdir -p {path}; image {dark} time={exposure} bin={bin} outfile={path}{fname} lowfile={path}{low_fname}',
         'inputs': {
-            'exposure': {
-                'value': None
-            },
-            'bin': {
-                'value': None
-            },
-            'path': {
-                'value': None
-            },
-            'fname': {
-                'value': None
-            },
-            'low_fname': {
-                'value': None
-            },
+            'exposure': {},
+            'bin': {},
+            'path': {},
+            'fname': {},
+            'low_fname': {},
             'dark': {
-                'value': None,
                 'default': ''
             }
         },
         'outputs': {
             'error': {
                 'regex': r'^.*$',
-                'value': None,
                 'type': str
             }
         }
@@ -106,27 +83,17 @@ telescope_interfaces = {
     'get_image': {
         'command': 'mkdir -p {path}; image {dark} time={exposure} bin={bin} outfile={path}{fname}',
         'inputs': {
-            'exposure': {
-                'value': None
-            },
-            'bin': {
-                'value': None
-            },
-            'path': {
-                'value': None
-            },
-            'fname': {
-                'value': None
-            },
+            'exposure': {},
+            'bin': {},
+            'path': {},
+            'fname': {},
             'dark': {
-                'value': None,
                 'default': ''
             }
         },
         'outputs': {
             'error': {
                 'regex': r'^.*$',
-                'value': None,
                 'type': str
             }
         }
@@ -136,8 +103,7 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'az': {
-                'regex': r'(?<=az=).*?$',
-                'value': None,
+                'regex': r'\baz=(.*)$',
                 'type': str
             }
         }
@@ -147,8 +113,7 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'az': {
-                'regex': r'(?<=az=).*?$',
-                'value': None,
+                'regex': r'\baz=(.*)$',
                 'type': str
             }
         }
@@ -158,13 +123,11 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'az_hit': {
-                'regex': r'(?<=az_hit=).*?(?= )',
-                'value': None,
+                'regex': r'\baz_hit=(\S*)',
                 'type': float
             },
             'rem': {
-                'regex': r'(?<=rem=).*?$',
-                'value': None,
+                'regex': r'\brem=(.*)$',
                 'type': str
             }
         }
@@ -174,13 +137,11 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'az_hit': {
-                'regex': r'(?<=az_hit=).*?(?= )',
-                'value': None,
+                'regex': r'\baz_hit=(\S*)',
                 'type': float
             },
             'rem': {
-                'regex': r'(?<=rem=).*?$',
-                'value': None,
+                'regex': r'\brem=(.*)$',
                 'type': str
             }
         }
@@ -190,43 +151,35 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             '1_on_off': {
-                'regex': r'(?<=one=).*?(?= )',
-                'value': None,
+                'regex': r'\bone=(\S*)',
                 'type': str
             },
             '2_on_off': {
-                'regex': r'(?<=two=).*?(?= )',
-                'value': None,
+                'regex': r'\btwo=(\S*)',
                 'type': str
             },
             '3_on_off': {
-                'regex': r'(?<=three=).*?(?= )',
-                'value': None,
+                'regex': r'\bthree=(\S*)',
                 'type': str
             },
             '4_on_off': {
-                'regex': r'(?<=four=).*?(?= )',
-                'value': None,
+                'regex': r'\bfour=(\S*)',
                 'type': str
             },
             '5_on_off': {
-                'regex': r'(?<=five=).*?(?= )',
-                'value': None,
+                'regex': r'\bfive=(\S*)',
                 'type': str
             },
             '6_on_off': {
-                'regex': r'(?<=six=).*?(?= )',
-                'value': None,
+                'regex': r'\bsix=(\S*)',
                 'type': str
             },
             '7_on_off': {
-                'regex': r'(?<=seven=).*?(?= )',
-                'value': None,
+                'regex': r'\bseven=(\S*)',
                 'type': str
             },
             '8_on_off': {
-                'regex': r'(?<=eight=).*?$',
-                'value': None,
+                'regex': r'\beight=(.*)$',
                 'type': str
             }
         }
@@ -234,17 +187,12 @@ telescope_interfaces = {
     'set_lights': {
         'command': 'tx lamps {light_number}={on_off}',
         'inputs': {
-            'light_number': {
-                'value': None
-            },
-            'on_off': {
-                'value': None
-            }
+            'light_number': {},
+            'on_off': {}
         },
         'outputs': {
             'on_off': {
-                'regex': r'(?<=one=).*?(?= )',
-                'value': None,
+                'regex': r'\bone=(\S*)',
                 'type': str
             }
         }
@@ -254,8 +202,7 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'open_close': {
-                'regex': r'(?<=state=).*?$',
-                'value': None,
+                'regex': r'\bstate=(.*)$',
                 'type': str
             }
         }
@@ -263,14 +210,11 @@ telescope_interfaces = {
     'set_mirror': {
         'command': 'tx mirror {open_close}',
         'inputs': {
-            'open_close': {
-                'value': None
-            }
+            'open_close': {}
         },
         'outputs': {
             'open_close': {
-                'regex': r'(?<=state=).*?$',
-                'value': None,
+                'regex': r'\bstate=(.*)$',
                 'type': str
             }
         }
@@ -280,8 +224,7 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'open_close': {
-                'regex': r'(?<=slit=).*?$',
-                'value': None,
+                'regex': r'\bslit=(.*)$',
                 'type': str
             }
         }
@@ -289,14 +232,11 @@ telescope_interfaces = {
     'set_slit': {
         'command': 'tx slit {open_close}',
         'inputs': {
-            'open_close': {
-                'value': None
-            }
+            'open_close': {}
         },
         'outputs': {
             'open_close': {
-                'regex': r'(?<=slit=).*?$',
-                'value': None,
+                'regex': r'\bslit=(.*)$',
                 'type': str
             }
         }
@@ -306,33 +246,27 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'nrow': {
-                'regex': r'(?<=nrow=).*?(?= )',
-                'value': None,
+                'regex': r'\bnrow=(\S*)',
                 'type': int
             },
             'ncol': {
-                'regex': r'(?<=ncol=).*?(?= )',
-                'value': None,
+                'regex': r'\bncol=(\S*)',
                 'type': int
             },
             'tchip': {
-                'regex': r'(?<=tchip=).*?(?= )',
-                'value': None,
+                'regex': r'\btchip=(\S*)',
                 'type': float
             },
             'setpoint': {
-                'regex': r'(?<=setpoint=).*?(?= )',
-                'value': None,
+                'regex': r'\bsetpoint=(\S*)',
                 'type': float
             },
             'name': {
-                'regex': r'(?<=name=).*?(?= )',
-                'value': None,
+                'regex': r'\bname=(\S*)',
                 'type': str
             },
             'drive': {
-                'regex': r'(?<=drive=).*?(?= )',
-                'value': None,
+                'regex': r'\bdrive=(\S*)',
                 'type': float
             }
         }
@@ -340,17 +274,12 @@ telescope_interfaces = {
     'set_ccd': {
         'command': 'ccd {cool_warm} nowait setpoint={setpoint} && echo 1 || echo 0',
         'inputs': {
-            'cool_warm': {
-                'value': None
-            },
-            'setpoint': {
-                'value': None
-            }
+            'cool_warm': {},
+            'setpoint': {}
         },
         'outputs': {
             'success': {
                 'regex': r'^[01]$',
-                'value': None,
                 'type': int
             },
         }
@@ -358,17 +287,12 @@ telescope_interfaces = {
     'get_skycam': {
         'command': 'rm -f {skycam_remote_file_path}; spacam; mv spacam.jpg {skycam_remote_file_path};  [ -e "{skycam_remote_file_path}" ] && echo 1 || echo 0',
         'inputs': {
-            'skycam_remote_file_path': {
-                'value': None
-            },
-            'skycam_local_file_path': {
-                'value': None
-            }
+            'skycam_remote_file_path': {},
+            'skycam_local_file_path': {}
         },
         'outputs': {
             'success': {
                 'regex': r'^[01]$',
-                'value': None,
                 'type': int
             },
         }
@@ -376,51 +300,31 @@ telescope_interfaces = {
     'get_domecam': {
         'command': 'curl --progress-bar -o {domecam_remote_file_path} {domecam_image_url}',
         'inputs': {
-            'domecam_image_url': {
-                'value': None
-            },
-            'domecam_remote_file_path': {
-                'value': None
-            }
+            'domecam_image_url': {},
+            'domecam_remote_file_path': {}
         },
         'outputs': {
             'success': {
                 'regex': r'100\.0',
-                'value': None,
                 'type': str
             },
         }
     },
     'to_stars': {
-        'command': 'bash -c "rsync -auvz --progress --files-from=<(find {image_dir} -mtime -3 -type f | sed -n \'s|^{image_dir}||p\') {image_dir} {stars_user}@{stars_url}:{stars_remote_dir}"',
+        'command': 'bash -c "rsync -auvz --progress -e \'ssh -o ControlMaster=auto -o ControlPath=~/.ssh/cm-%r@%h:%p -o ControlPersist=60s -o ServerAliveInterval=30 -o ServerAliveCountMax=3\' --files-from=<(find {image_dir} -mtime -3 -type f | sed -n \'s|^{image_dir}||p\') {image_dir} {stars_user}@{stars_url}:{stars_remote_dir}"',
         'is_background': False,
         'inputs': {
-            'image_dir': {
-                'value': None
-            },
-            'stars_remote_dir': {
-                'value': None
-            },
-            'stars_key_path': {
-                'value': None
-            },
-            'stars_user': {
-                'value': None
-            },
-            'stars_url': {
-                'value': None
-            },
-            'year': {
-                'value': None
-            },
-            'date': {
-                'value': None
-            }
+            'image_dir': {},
+            'stars_remote_dir': {},
+            'stars_key_path': {},
+            'stars_user': {},
+            'stars_url': {},
+            'year': {},
+            'date': {}
         },
         'outputs': {
             'error': {
                 'regex': r'^.*$',
-                'value': None,
                 'type': str
             }
         }
@@ -429,17 +333,12 @@ telescope_interfaces = {
         'command': 'tx offset dec={dDEC} ra={dRA}',
         'is_background': False,
         'inputs': {
-            'dRA': {
-                'value': None
-            },
-            'dDEC': {
-                'value': None
-            },
+            'dRA': {},
+            'dDEC': {},
         },
         'outputs': {
             'success': {
                 'regex': r'^done offset',
-                'value': None,
                 'optional': False,
                 'type': str
             }
@@ -449,20 +348,13 @@ telescope_interfaces = {
         'command': '{psfex_bin_path} {sextractor_cat_path} -c {psfex_cfg_path}',
         'is_background': False,
         'inputs': {
-            'psfex_bin_path': {
-                'value': None
-            },
-            'sextractor_cat_path': {
-                'value': None
-            },
-            'psfex_cfg_path': {
-                'value': None
-            }
+            'psfex_bin_path': {},
+            'sextractor_cat_path': {},
+            'psfex_cfg_path': {}
         },
         'outputs': {
             'success': {
                 'regex': r'> All done',
-                'value': None,
                 'optional': False,
                 'type': str
             }
@@ -472,32 +364,17 @@ telescope_interfaces = {
         'command': '{sextractor_bin_path} {path}{fname} -c {sextractor_sex_path} -CATALOG_NAME {sextractor_cat_path} -PARAMETERS_NAME {sextractor_param_path} -FILTER_NAME {sextractor_conv_path}',
         'is_background': False,
         'inputs': {
-            'sextractor_bin_path': {
-                'value': None
-            },
-            'path': {
-                'value': None
-            },
-            'fname': {
-                'value': None
-            },
-            'sextractor_sex_path': {
-                'value': None
-            },
-            'sextractor_cat_path': {
-                'value': None
-            },
-            'sextractor_param_path': {
-                'value': None
-            },
-            'sextractor_conv_path': {
-                'value': None
-            }
+            'sextractor_bin_path': {},
+            'path': {},
+            'fname': {},
+            'sextractor_sex_path': {},
+            'sextractor_cat_path': {},
+            'sextractor_param_path': {},
+            'sextractor_conv_path': {}
         },
         'outputs': {
             'success': {
                 'regex': r'> All done',
-                'value': None,
                 'optional': False,
                 'type': str
             }
@@ -507,48 +384,25 @@ telescope_interfaces = {
         'command': '{solve_field_path} --no-verify --overwrite --no-remove-lines --downsample {downsample} --scale-units arcsecperpix --no-plots --scale-low {scale_low} --scale-high {scale_high} --ra {ra_target} --dec {dec_target} --radius {radius} --cpulimit {cpulimit} {path}{fname}; rm -f {path}*.axy; rm -f {path}*.corr; rm -f {path}*.match; rm -f {path}*.new; rm -f {path}*.rdls; rm -f {path}*.solved; rm -f {path}*.wcs',
         'is_background': False,
         'inputs': {
-            'solve_field_path': {
-                'value': None
-            },
-            'downsample': {
-                'value': None
-            },
-            'scale_low': {
-                'value': None
-            },
-            'scale_high': {
-                'value': None
-            },
-            'ra_target': {
-                'value': None
-            },
-            'dec_target': {
-                'value': None
-            },
-            'radius': {
-                'value': None
-            },
-            'cpulimit': {
-                'value': None
-            },
-            'fname': {
-                'value': None
-            },
-            'path': {
-                'value': None
-            }
+            'solve_field_path': {},
+            'downsample': {},
+            'scale_low': {},
+            'scale_high': {},
+            'ra_target': {},
+            'dec_target': {},
+            'radius': {},
+            'cpulimit': {},
+            'fname': {},
+            'path': {}
         },
         # Field center: (RA,Dec) = (132.077893, 26.584066) deg.
         'outputs': {
             'ra_image': {
-                'regex': r'(?<=Field center: \(RA,Dec\) = \().*?(?=\,)',
-                'value': None,
+                'regex': r'Field center: \(RA,Dec\) = \(([^,]*),',
                 'type': str
             },
-            # I don't love this...
             'dec_image': {
-                'regex': r'(?<=, ).*?(?=\) deg.)',
-                'value': None,
+                'regex': r'Field center: \(RA,Dec\) = \([^,]*, ([^)]*)\) deg\.',
                 'type': str
             }
         }
@@ -556,23 +410,14 @@ telescope_interfaces = {
     'convert_fits_to_jpg_hdr': {
         'command': 'rm -f {jpg_file}; rm -f {tiff_file}; mv {fits_file_hdr} {fits_file}; stiffy {fits_file} {tiff_file}; convert -resize 50% -normalize -quality 75 {tiff_file} {jpg_file};  [ -e "{jpg_file}" ] && echo 1 || echo 0',
         'inputs': {
-            'fits_file': {
-                'value': None
-            },
-            'fits_file_hdr': {
-                'value': None
-            },
-            'tiff_file': {
-                'value': None
-            },
-            'jpg_file': {
-                'value': None
-            }
+            'fits_file': {},
+            'fits_file_hdr': {},
+            'tiff_file': {},
+            'jpg_file': {}
         },
         'outputs': {
             'success': {
                 'regex': r'^[01]$',
-                'value': None,
                 'type': int
             },
         }
@@ -580,47 +425,39 @@ telescope_interfaces = {
     'convert_fits_to_jpg': {
         'command': 'rm -f {jpg_file}; rm -f {tiff_file}; stiffy {fits_file} {tiff_file}; convert -resize 50% -normalize -quality 75 {tiff_file} {jpg_file};  [ -e "{jpg_file}" ] && echo 1 || echo 0',
         'inputs': {
-            'fits_file': {
-                'value': None
-            },
-            'tiff_file': {
-                'value': None
-            },
-            'jpg_file': {
-                'value': None
-            }
+            'fits_file': {},
+            'tiff_file': {},
+            'jpg_file': {}
         },
         'outputs': {
             'success': {
                 'regex': r'^[01]$',
-                'value': None,
                 'type': int
             },
         }
     },
     'get_sun': {
         'command': 'sun',
+        'cache_ttl': 60,
         'inputs': {},
         'outputs': {
             'alt': {
-                'regex': r'(?<=alt=).*?$',
-                'value': None,
+                'regex': r'\balt=(.*)$',
                 'type': float
             }
         }
     },
     'get_moon': {
         'command': 'moon',
+        'cache_ttl': 60,
         'inputs': {},
         'outputs': {
             'alt': {
-                'regex': r'(?<=alt=).*?(?= )',
-                'value': None,
+                'regex': r'\balt=(\S*)',
                 'type': float
             },
             'phase': {
-                'regex': r'(?<=phase=).*?(?= )',
-                'value': None,
+                'regex': r'\bphase=(\S*)',
                 'type': float
             }
         }
@@ -630,18 +467,15 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'clouds': {
-                'regex': r'(?<=cloud=).*?(?= )',
-                'value': None,
+                'regex': r'\bcloud=(\S*)',
                 'type': float
             },
             'rain': {
-                'regex': r'(?<=rain=).*?(?= )',
-                'value': None,
+                'regex': r'\brain=(\S*)',
                 'type': float
             },
             'dew': {
-                'regex': r'(?<=dew=).*?$',
-                'value': None,
+                'regex': r'\bdew=(.*)$',
                 'type': float
             }
         }
@@ -651,13 +485,11 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'num': {
-                'regex': r'(?<=num=).*?(?= )',
-                'value': None,
+                'regex': r'\bnum=(\S*)',
                 'type': int
             },
             'name': {
-                'regex': r'(?<=name=).*?$',
-                'value': None,
+                'regex': r'\bname=(.*)$',
                 'type': str
             }
         }
@@ -665,19 +497,15 @@ telescope_interfaces = {
     'set_filter': {
         'command': 'tx filter num={num}',
         'inputs': {
-            'num': {
-                'value': None
-            },
+            'num': {},
         },
         'outputs': {
             'num': {
-                'regex': r'(?<=num=).*?(?= )',
-                'value': None,
+                'regex': r'\bnum=(\S*)',
                 'type': int
             },
             'name': {
-                'regex': r'(?<=name=).*?$',
-                'value': None,
+                'regex': r'\bname=(.*)$',
                 'type': str
             }
         }
@@ -687,8 +515,7 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'pos': {
-                'regex': r'(?<=pos=)[0-9]+',
-                'value': None,
+                'regex': r'\bpos=([0-9]+)',
                 'type': int
             }
         }
@@ -696,14 +523,11 @@ telescope_interfaces = {
     'set_focus': {
         'command': 'tx focus pos={pos}',
         'inputs': {
-            'pos': {
-                'value': None
-            }
+            'pos': {}
         },
         'outputs': {
             'pos': {
-                'regex': r'(?<=pos=).*?$',
-                'value': None,
+                'regex': r'\bpos=(.*)$',
                 'type': int
             }
         }
@@ -713,32 +537,27 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'user': {
-                'regex': r'(?<=user=).*?(?= )',
-                'value': None,
+                'regex': r'\buser=(\S*)',
                 'optional': True,
                 'type': str
             },
             'email': {
-                'regex': r'(?<=email=).*?(?= )',
-                'value': None,
+                'regex': r'\bemail=(\S*)',
                 'optional': True,
                 'type': str
             },
             'phone': {
-                'regex': r'(?<=phone=).*?(?= )',
-                'value': None,
+                'regex': r'\bphone=(\S*)',
                 'optional': True,
                 'type': str
             },
             'comment': {
-                'regex': r'(?<=comment=).*?(?= )',
-                'value': None,
+                'regex': r'\bcomment=(\S*)',
                 'optional': True,
                 'type': str
             },
             'timestamp': {
-                'regex': r'(?<=timestamp=).*?$',
-                'value': None,
+                'regex': r'\btimestamp=(.*)$',
                 'optional': True,
                 'type': str
             }
@@ -751,7 +570,6 @@ telescope_interfaces = {
         'outputs': {
             'success': {
                 'regex': r'^done lock',
-                'value': None,
                 'optional': False,
                 'type': str
             }
@@ -764,7 +582,6 @@ telescope_interfaces = {
         'outputs': {
             'failure': {
                 'regex': r'ERROR',
-                'value': None,
                 'optional': True,
                 'type': str
             }
@@ -773,9 +590,7 @@ telescope_interfaces = {
     'keepopen': {
         'command': 'keepopen kill maxtime={maxtime} dome >& /dev/null',
         'inputs': {
-            'maxtime': {
-                'value': None
-            }
+            'maxtime': {}
         },
         'outputs': {
         }
@@ -787,7 +602,6 @@ telescope_interfaces = {
         'outputs': {
             'failure': {
                 'regex': r'ERROR',
-                'value': None,
                 'optional': True,
                 'type': str
             }
@@ -800,7 +614,6 @@ telescope_interfaces = {
         'outputs': {
             'success': {
                 'regex': r'^done lock',
-                'value': None,
                 'optional': False,
                 'type': str
             }
@@ -809,38 +622,31 @@ telescope_interfaces = {
     'set_lock': {
         'command': 'tx lock user={user}',
         'inputs': {
-            'user': {
-                'value': None
-            }
+            'user': {}
         },
         'outputs': {
             'user': {
-                'regex': r'(?<=user=).*?(?= )',
-                'value': None,
+                'regex': r'\buser=(\S*)',
                 'optional': False,
                 'type': str
             },
             'email': {
-                'regex': r'(?<=email=).*?(?= )',
-                'value': None,
+                'regex': r'\bemail=(\S*)',
                 'optional': True,
                 'type': str
             },
             'phone': {
-                'regex': r'(?<=phone=).*?(?= )',
-                'value': None,
+                'regex': r'\bphone=(\S*)',
                 'optional': True,
                 'type': str
             },
             'comment': {
-                'regex': r'(?<=comment=).*?(?= )',
-                'value': None,
+                'regex': r'\bcomment=(\S*)',
                 'optional': True,
                 'type': str
             },
             'timestamp': {
-                'regex': r'(?<=timestamp=).*?$',
-                'value': None,
+                'regex': r'\btimestamp=(.*)$',
                 'optional': True,
                 'type': str
             }
@@ -851,28 +657,23 @@ telescope_interfaces = {
         'inputs': {},
         'outputs': {
             'ra': {
-                'regex': r'(?<=ra=).*?(?= )',
-                'value': None,
+                'regex': r'\bra=(\S*)',
                 'type': str
             },
             'dec': {
-                'regex': r'(?<=dec=).*?(?= )',
-                'value': None,
+                'regex': r'\bdec=(\S*)',
                 'type': str
             },
             'alt': {
-                'regex': r'(?<=alt=).*?(?= )',
-                'value': None,
+                'regex': r'\balt=(\S*)',
                 'type': float
             },
             'az': {
-                'regex': r'(?<=az=).*?(?= )',
-                'value': None,
+                'regex': r'\baz=(\S*)',
                 'type': float
             },
             'slewing': {
-                'regex': r'(?<=slewing=).*?$',
-                'value': None,
+                'regex': r'\bslewing=(.*)$',
                 'type': int,
                 'optional': True
             }
@@ -880,150 +681,335 @@ telescope_interfaces = {
     },
 }
 
+# most outputs are plain key=value fields: \bkey=(\S*) or \bkey=(.*)$
+KV_REGEX = re.compile(r'\\b(\w+)=(\(\\S\*\)|\(\.\*\)\$)')
+
+
+# return (field name, 'field=' prefix if the value runs to the end of the line else None)
+# for a key=value output regex, else None
+def kv_field(regex):
+    match = KV_REGEX.fullmatch(regex)
+    if match:
+        field = match.group(1)
+        return field, field + '=' if match.group(2) == '(.*)$' else None
+    return None
+
+
+# split a response line into its whitespace-separated key=value fields (first one wins)
+def parse_kv(line):
+    fields = dict()
+    for token in line.split():
+        key, separator, value = token.partition('=')
+        if separator:
+            fields.setdefault(key, value)
+    return fields
+
+
+# value of the first key=value field (prefix is 'key=') on the line, up to the end of the
+# line (or None); the prefix only counts at the start of the line or after a space
+def parse_kv_tail(line, prefix):
+    index = line.find(prefix)
+    while index > 0 and line[index - 1] != ' ':
+        index = line.find(prefix, index + 1)
+    if index < 0:
+        return None
+    return line[index + len(prefix):]
+
+
+# fixed-text outputs like ^done lock, ERROR or ^[01]$ are compared without a regex
+LITERAL_REGEX = re.compile(
+    r'(\^?)((?:[^.^$*+?{}\[\]\\|()]|\\[^A-Za-z0-9])+|\[[^\]\\^-]+\])(\$?)')
+
+
+# return (alternatives, anchored at start?, anchored at end?) for a fixed-text regex, else None
+def literal_field(regex):
+    match = LITERAL_REGEX.fullmatch(regex)
+    if not match:
+        return None
+    text = match.group(2)
+    if text.startswith('['):
+        # a class of single characters, any one of them
+        alternatives = tuple(text[1:-1])
+    else:
+        alternatives = (re.sub(r'\\(.)', r'\1', text),)
+    return alternatives, match.group(1) == '^', match.group(3) == '$'
+
+
+# the first of the alternatives found on the line (or None)
+def match_literal(line, alternatives, at_start, at_end):
+    for text in alternatives:
+        if at_start and at_end:
+            found = line == text
+        elif at_start:
+            found = line.startswith(text)
+        elif at_end:
+            found = line.endswith(text)
+        else:
+            found = text in line
+        if found:
+            return text
+    return None
+
+
+# everything assign_outputs needs to know about an interface, worked out once
+# and shared (read-only) by all of its TelescopeInterface instances
+class InterfaceSpec:
+    __slots__ = ('output_keys', 'input_keys', 'patterns', 'kv_outputs', 'literal_outputs',
+                 'output_flags', 'regex_keys', 'branches', 'fused_pattern', 'anchored',
+                 'output_defaults', 'input_defaults')
+
+    def __init__(self, interface):
+        outputs = interface['outputs']
+        self.output_keys = tuple(outputs)
+        self.input_keys = tuple(interface['inputs'])
+        # compiled output regexes, by output key
+        self.patterns = {key: re.compile(output['regex']) for key, output in outputs.items()}
+        # (key, field, 'field=' if the value runs to end of line) of the key=value outputs,
+        # read without a regex
+        self.kv_outputs = tuple(
+            (key,) + kv_field(output['regex'])
+            for key, output in outputs.items()
+            if kv_field(output['regex']) is not None)
+        # (key, alternatives, at start?, at end?) of the fixed-text outputs
+        self.literal_outputs = tuple(
+            (key,) + literal_field(output['regex'])
+            for key, output in outputs.items()
+            if literal_field(output['regex']) is not None)
+        self.output_flags = tuple(
+            (key, output.get('optional', False), output['type']) for key, output in outputs.items())
+        # values a new instance starts from (output defaults already converted to their type)
+        self.output_defaults = {
+            key: None if output.get('default') is None else output['type'](output['default'])
+            for key, output in outputs.items()}
+        self.input_defaults = {
+            key: field.get('default') for key, field in interface['inputs'].items()}
+        # the remaining output regexes fused into one alternation, so a line is scanned once
+        # for all of them instead of once per output; a match's lastindex is the group
+        # around its branch, which maps to (key, group holding the value)
+        plain_keys = set(output[0] for output in self.kv_outputs + self.literal_outputs)
+        self.regex_keys = tuple(key for key in outputs if key not in plain_keys)
+        self.branches = dict()
+        group = 1
+        for key in self.regex_keys:
+            inner_groups = self.patterns[key].groups
+            self.branches[group] = (key, group + 1 if inner_groups else group)
+            group += 1 + inner_groups
+        self.fused_pattern = re.compile(
+            '|'.join('(%s)' % outputs[key]['regex'] for key in self.regex_keys))
+        # every remaining regex starts with ^, so a line can only match at its start and
+        # match() does instead of a search over every position
+        self.anchored = bool(self.regex_keys) and all(
+            outputs[key]['regex'].startswith('^') for key in self.regex_keys)
+
+
+# parse one response holding the outputs of several interfaces, one after the other with
+# a separator line in between, and assign each interface its own slice of it
+# (raises if the response ends before every interface got its slice)
+def parse_many(interfaces, result, separator):
+    responses = [[]]
+    for line in result:
+        if line.strip() == separator:
+            responses.append([])
+        else:
+            responses[-1].append(line)
+    for interface, response in zip(interfaces, responses):
+        interface.assign_outputs(response)
+    if len(responses) < len(interfaces):
+        logger.error(
+            'Response has %d of %d outputs (%s).', len(responses), len(interfaces), result)
+        raise ValueError('%d of %d outputs are missing' % (
+            len(interfaces) - len(responses), len(interfaces)))
+
+
+# specs are built (and their regexes compiled) on first use, so importing the module stays
+# cheap and a session only pays for the interfaces it actually runs
+@functools.lru_cache(maxsize=None)
+def interface_spec(name):
+    return InterfaceSpec(telescope_interfaces[name])
+
 
 class TelescopeInterface:
+    # one of these is created per telescope command, keep it to a fixed set of slots
+    __slots__ = ('command', 'spec', 'input_values', 'output_values')
 
     def __init__(self, name):
-        self.logger = logging.getLogger('ixchel.TelescopeInterface')
         self.command = self.assign(name)
-        # reset command inputs and outputs
-        self.set_defaults()
+        self.spec = interface_spec(name)
+        # values live on the instance (starting from the defaults), telescope_interfaces
+        # is a shared template
+        self.input_values = dict(self.spec.input_defaults)
+        self.output_values = dict(self.spec.output_defaults)
 
     # assign the specific interface by name
 
     def assign(self, name):
-        for key, value in telescope_interfaces.items():
-            if key == name:
-                return value
-        self.logger.error('Command (%s) not found.' % name)
+        if name in telescope_interfaces:
+            return telescope_interfaces[name]
+        logger.error('Command (%s) not found.', name)
         raise ValueError('Command (%s) not found.' % name)
 
+    # reset command inputs and outputs
     def set_defaults(self):
-        for key in self.get_output_keys():
-            self.set_output_value(key, self.get_output_default(key))
-        for key in self.get_input_keys():
-            self.set_input_value(key, self.get_input_default(key))
+        self.output_values.update(self.spec.output_defaults)
+        self.input_values.update(self.spec.input_defaults)
 
     # get command text
     def get_command(self):
         return self.command['command']
 
-    # get is_background
+    # get is_background (commands run in the foreground unless they say otherwise)
     def is_background(self):
-        try:
-            return self.command['is_background']
-        except Exception as e:
-            self.logger.info(
-                'A value of is_background not found. Assumed False.')
-            return False
+        return self.command.get('is_background', False)
+
+    # get cache_ttl (seconds a getter response may be reused)
+    def get_cache_ttl(self):
+        return self.command.get('cache_ttl', 0)
 
     # get names (keys) of all outputs
     def get_output_keys(self):
-        return self.command['outputs'].keys()
+        return self.spec.output_keys
 
     # get names (keys) of all inputs
     def get_input_keys(self):
-        return self.command['inputs'].keys()
+        return self.spec.input_keys
 
     # get output value by name
     def get_output_value(self, name):
-        if name in self.command['outputs']:
-            try:
-                if self.command['outputs'][name]['value'] == None:
-                    return self.command['outputs'][name]['value']
-                else:
-                    return self.command['outputs'][name]['type'](self.command['outputs'][name]['value'])
-            except Exception as e:
-                self.logger.error('Command output conversion (%s) failed.' %
-                                  self.command['outputs'][name]['type'])
+        # values are converted to the output type when they are set
+        if name in self.output_values:
+            return self.output_values[name]
         else:
-            self.logger.error('Command output (%s) value not found.' % name)
+            logger.error('Command output (%s) value not found.', name)
             return None
 
     # get regex that defines this output value
     def get_output_regex(self, name):
-        try:
+        if name in self.command['outputs']:
             return self.command['outputs'][name]['regex']
-        except Exception as e:
-            self.logger.error('Command output (%s) regex not found.' % name)
-            return None
+        logger.error('Command output (%s) regex not found.', name)
+        return None
 
     # get default for this output value
+    # (most outputs have no default, that is not worth a warning on every construction)
     def get_output_default(self, name):
-        try:
-            return self.command['outputs'][name]['default']
-        except Exception as e:
-            self.logger.warning(
-                'Command output (%s) default not found. Assumed None.' % name)
-            return None
+        if name in self.command['outputs']:
+            return self.command['outputs'][name].get('default')
+        logger.warning(
+            'Command output (%s) default not found. Assumed None.', name)
+        return None
 
     # is this output value marked as optional?
     def is_output_optional(self, name):
-        try:
+        if name in self.command['outputs']:
             return self.command['outputs'][name].get('optional', False)
-        except Exception as e:
-            self.logger.error(
-                'Command output (%s) is_optional not found.' % name)
-            return False
+        logger.error(
+            'Command output (%s) is_optional not found.', name)
+        return False
 
     # set output value by name
     def set_output_value(self, name, value):
-        try:
-            self.command['outputs'][name]['value'] = value
-        except Exception as e:
-            self.logger.error('Output (%s) not found.' % name)
+        if name in self.command['outputs']:
+            self.store_output(name, self.command['outputs'][name]['type'], value)
+        else:
+            logger.error('Output (%s) not found.', name)
             raise ValueError('Output (%s) not found.' % name)
 
+    # convert an output value to its type once, here, rather than on every get
+    # (str outputs arrive as str already and skip the call)
+    def store_output(self, name, cast, value):
+        if value is not None and type(value) is not cast:
+            try:
+                value = cast(value)
+            except (TypeError, ValueError):
+                logger.error('Command output conversion (%s) failed.', cast)
+                value = None
+        self.output_values[name] = value
+
     # get input value by name
     def get_input_value(self, name):
-        try:
-            return self.command['inputs'][name]['value']
-        except Exception as e:
-            self.logger.error('Command input (%s) not found.' % name)
-            return None
+        if name in self.input_values:
+            return self.input_values[name]
+        logger.error('Command input (%s) not found.', name)
+        return None
 
     # get default for this output value
     def get_input_default(self, name):
-        try:
-            return self.command['inputs'][name]['default']
-        except Exception as e:
-            self.logger.warning(
-                'Command input (%s) default not found. Assumed None.' % name)
-            return None
+        if name in self.command['inputs']:
+            return self.command['inputs'][name].get('default')
+        logger.warning(
+            'Command input (%s) default not found. Assumed None.', name)
+        return None
 
     # set input value by name
     def set_input_value(self, name, value):
-        try:
-            self.command['inputs'][name]['value'] = value
-        except Exception as e:
-            self.logger.error('Input (%s) not found.' % name)
+        if name in self.command['inputs']:
+            self.input_values[name] = value
+        else:
+            logger.error('Input (%s) not found.', name)
             raise ValueError('Input (%s) not found.' % name)
 
     # parse result and assign output values
     def assign_outputs(self, result):
-        for key in self.get_output_keys():
-            # process all lines in output
-            for line in result:
-                match = re.search(self.get_output_regex(key), line)
-                if match:
-                    break
-            if match:
-                self.set_output_value(key, match.group(0))
+        spec = self.spec
+        kv_outputs = spec.kv_outputs
+        literal_outputs = spec.literal_outputs
+        regex_keys = spec.regex_keys
+        fused_pattern = spec.fused_pattern
+        anchored = spec.anchored
+        # first match of each output, found in a single pass over all lines
+        matches = dict()
+        for line in result:
+            if len(matches) == len(spec.output_keys):
+                # every output has its first match, later lines cannot change them
+                break
+            if kv_outputs:
+                fields = parse_kv(line)
+                for key, field, tail_prefix in kv_outputs:
+                    if key in matches:
+                        continue
+                    if tail_prefix:
+                        # the value is the rest of the line and may contain spaces
+                        value = parse_kv_tail(line, tail_prefix)
+                        if value is not None:
+                            matches[key] = value
+                    elif field in fields:
+                        matches[key] = fields[field]
+            for key, alternatives, at_start, at_end in literal_outputs:
+                if key not in matches:
+                    value = match_literal(line, alternatives, at_start, at_end)
+                    if value is not None:
+                        matches[key] = value
+            if regex_keys:
+                if anchored:
+                    found = (fused_pattern.match(line),)
+                else:
+                    found = fused_pattern.finditer(line)
+                for match in found:
+                    if match is not None and match.lastindex is not None:
+                        key, group = spec.branches[match.lastindex]
+                        matches.setdefault(key, match.group(group))
+        for key, optional, cast in spec.output_flags:
+            if key not in matches and key in regex_keys:
+                # a longer match of another output may have covered this one, search it alone
+                pattern = spec.patterns[key]
+                search = pattern.match if anchored else pattern.search
+                for line in result:
+                    match = search(line)
+                    if match:
+                        matches[key] = match.group(1 if pattern.groups else 0)
+                        break
+            if key in matches:
+                self.store_output(key, cast, matches[key])
             else:
-                if self.is_output_optional(key):
-                    self.logger.warning(
-                        '%s value is missing (but optional).' % key)
+                if optional:
+                    logger.warning(
+                        '%s value is missing (but optional).', key)
                 else:
-                    # TODO: FIX THE PROBLEM WITH STRIP HERE?
-                    self.logger.error(
-                        '%s value is missing or invalid (%s).' % (key, result.strip()))
-                    raise ValueError(
-                        '%s value is missing or invalid' % (key, result.strip()))
+                    logger.error(
+                        '%s value is missing or invalid (%s).', key, result)
+                    raise ValueError('%s value is missing or invalid' % key)
 
     # parse result and assign output values
     def assign_inputs(self):
-        inputs = dict()
-        for key in self.get_input_keys():
-            inputs[key] = self.get_input_value(key)
-        # self.logger.debug(inputs)
-        return self.get_command().format(**inputs)
+        # input_values holds every input (it starts from a copy of the defaults)
+        return self.get_command().format_map(self.input_values)